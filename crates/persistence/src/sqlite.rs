@@ -50,10 +50,15 @@ const INSERT_EVENT_SQL: &str = "\
     (tr_id, doc_id, ts, actor, idempotency_key, meta, payload, checksum) \
     VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8)";
 
+// 冲突时原地更新，避免 `INSERT OR REPLACE` 先删后插带来的二级索引重写
 const UPSERT_SNAPSHOT_SQL: &str = "\
-    INSERT OR REPLACE INTO snapshots \
+    INSERT INTO snapshots \
     (doc_id, upto_lsn, created_at, state_blob, version) \
-    VALUES (?1, ?2, ?3, ?4, ?5)";
+    VALUES (?1, ?2, ?3, ?4, ?5) \
+    ON CONFLICT(doc_id, upto_lsn) DO UPDATE SET \
+    created_at = excluded.created_at, \
+    state_blob = excluded.state_blob, \
+    version = excluded.version";
 
 /// `EventStore` 的 SQLite 具体实现。
 pub struct SqliteEventStore {
@@ -331,3 +336,57 @@ impl From<SnapshotRow> for Snapshot {
 struct UptoRow {
     upto_lsn: i64,
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[derive(Debug, Deserialize)]
+    struct CountRow {
+        n: i64,
+    }
+
+    fn snapshot(
+        created_at: i64,
+        state_blob: &[u8],
+        version: i32,
+    ) -> Snapshot {
+        Snapshot {
+            doc_id: "doc-1".to_string(),
+            upto_lsn: 10,
+            created_at,
+            state_blob: state_blob.to_vec(),
+            version,
+        }
+    }
+
+    #[tokio::test]
+    async fn test_write_snapshot_upsert_round_trip() {
+        let dir = tempfile::tempdir().unwrap();
+        let store = SqliteEventStore::open(dir.path(), CommitMode::MemoryOnly)
+            .await
+            .unwrap();
+
+        store.write_snapshot(snapshot(100, b"first", 1)).await.unwrap();
+        let latest = store.latest_snapshot("doc-1").await.unwrap().unwrap();
+        assert_eq!(latest.state_blob, b"first");
+
+        // 相同 (doc_id, upto_lsn) 再次写入应更新原有行而不是新增
+        store.write_snapshot(snapshot(200, b"second", 2)).await.unwrap();
+        let latest = store.latest_snapshot("doc-1").await.unwrap().unwrap();
+        assert_eq!(latest.upto_lsn, 10);
+        assert_eq!(latest.created_at, 200);
+        assert_eq!(latest.state_blob, b"second");
+        assert_eq!(latest.version, 2);
+
+        let conn = store.pool.acquire().await.unwrap();
+        let rows: Vec<CountRow> = conn
+            .query_decode(
+                "SELECT COUNT(*) AS n FROM snapshots WHERE doc_id = ?1",
+                vec![to_value("doc-1")],
+            )
+            .await
+            .unwrap();
+        assert_eq!(rows[0].n, 1);
+    }
+}
@@ -212,11 +212,25 @@ impl SqliteBackend {
         let attrs_flat_json = serde_json::to_string(&attrs_map)?;
         let path_str = format!("/{}", doc.path.join("/"));
 
+        // 冲突时原地更新，触发 nodes_au 同步 FTS；`INSERT OR REPLACE` 的隐式删除
+        // 不会触发 nodes_ad，会在 nodes_fts 中留下失效条目
         exec.exec(
-            "INSERT OR REPLACE INTO nodes
+            "INSERT INTO nodes
              (id, node_type, parent_id, path, marks, marks_json, attrs, attrs_json, text,
               order_i64, created_at_i64, updated_at_i64)
-             VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12)",
+             VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12)
+             ON CONFLICT(id) DO UPDATE SET
+              node_type = excluded.node_type,
+              parent_id = excluded.parent_id,
+              path = excluded.path,
+              marks = excluded.marks,
+              marks_json = excluded.marks_json,
+              attrs = excluded.attrs,
+              attrs_json = excluded.attrs_json,
+              text = excluded.text,
+              order_i64 = excluded.order_i64,
+              created_at_i64 = excluded.created_at_i64,
+              updated_at_i64 = excluded.updated_at_i64",
             vec![
                 to_value(doc.node_id.clone()),
                 to_value(doc.node_type.clone()),
@@ -784,4 +798,43 @@ mod tests {
         let empty = backend.get_docs_by_ids(&[]).await.unwrap();
         assert_eq!(empty.len(), 0);
     }
+
+    #[tokio::test]
+    async fn test_upsert_updates_fulltext_index() {
+        let backend = SqliteBackend::new_in_system_temp().await.unwrap();
+
+        let doc = IndexDoc {
+            node_id: "para1".to_string(),
+            node_type: "paragraph".to_string(),
+            parent_id: None,
+            path: vec!["para1".to_string()],
+            marks: vec![],
+            marks_json: "[]".to_string(),
+            attrs_flat: vec![],
+            attrs_json: "{}".to_string(),
+            text: Some("apple".to_string()),
+            order_i64: None,
+            created_at_i64: None,
+            updated_at_i64: None,
+        };
+        backend.apply(vec![IndexMutation::Add(doc.clone())]).await.unwrap();
+
+        let updated = IndexDoc { text: Some("banana".to_string()), ..doc };
+        backend.apply(vec![IndexMutation::Upsert(updated)]).await.unwrap();
+
+        let text_query = |text: &str| SearchQuery {
+            text: Some(text.to_string()),
+            limit: 10,
+            ..Default::default()
+        };
+        let old = backend.search_ids(text_query("apple")).await.unwrap();
+        assert!(old.is_empty());
+        let new = backend.search_ids(text_query("banana")).await.unwrap();
+        assert_eq!(new, vec!["para1"]);
+
+        let docs =
+            backend.get_docs_by_ids(&["para1".to_string()]).await.unwrap();
+        assert_eq!(docs.len(), 1);
+        assert_eq!(docs[0].text, Some("banana".to_string()));
+    }
 }
@@ -9,6 +9,7 @@
 //! - 回归检测
 
 use std::collections::HashMap;
+use std::io::Write;
 use std::process::{Command, Stdio};
 use std::time::{Duration, Instant};
 use serde::{Serialize, Deserialize};
@@ -266,8 +267,7 @@ impl BenchmarkCoordinator {
 
         // 保存综合结果
         let summary_file = format!("{output_dir}/summary.json");
-        let summary_json = serde_json::to_string_pretty(&all_results)?;
-        std::fs::write(&summary_file, summary_json)?;
+        write_results_json(&summary_file, &all_results)?;
 
         println!("✅ 全部基准测试完成，结果保存在: {output_dir}");
         Ok(())
@@ -340,58 +340,117 @@ async fn execute_crate_benchmark(
 
     // 保存单独的结果文件
     let crate_output_file = format!("{}/{}.json", output_dir, crate_info.name);
-    let results_json = serde_json::to_string_pretty(&results)?;
-    std::fs::write(&crate_output_file, results_json)?;
+    write_results_json(&crate_output_file, &results)?;
 
     println!("    ✅ {} 完成 ({} 个基准测试)", crate_info.name, results.len());
 
     Ok(results)
 }
 
+/// Criterion 时间单位到纳秒的换算系数
+///
+/// 微秒同时接受 U+00B5（µ，Criterion 默认输出）和 U+03BC（μ）两种写法。
+const TIME_UNITS: [(&str, f64); 7] = [
+    ("ps", 0.001),
+    ("ns", 1.0),
+    ("µs", 1_000.0),
+    ("μs", 1_000.0),
+    ("us", 1_000.0),
+    ("ms", 1_000_000.0),
+    ("s", 1_000_000_000.0),
+];
+
+fn time_unit_to_ns(unit: &str) -> Option<f64> {
+    TIME_UNITS.iter().find(|(u, _)| *u == unit).map(|(_, factor)| *factor)
+}
+
+/// 解析 Criterion 的时间估计，返回基准名称和中位估计值（纳秒）
+///
+/// 调用方已按 `time:` 切分好该行，`name` 为其前半部分，`rest` 为后半部分。
+/// 示例行: "node_creation              time:   [1.2345 ms 1.2456 ms 1.2567 ms]"
+///
+/// 基准名称过长时 Criterion 会把名称单独输出在上一行，`time:` 行前只剩缩进，
+/// 此时使用 `previous_line` 作为基准名称。
+fn parse_criterion_time<'a>(
+    name: &'a str,
+    rest: &str,
+    previous_line: Option<&'a str>,
+) -> Option<(&'a str, u64)> {
+    let benchmark_name = match name.trim() {
+        "" => previous_line?.trim(),
+        name => name,
+    };
+    let estimates = rest.trim_start().strip_prefix('[')?;
+
+    // 区间为 [下界 单位 估计值 单位 上界 单位]，取中间的估计值
+    let mut tokens = estimates.split_whitespace().skip(2);
+    let value = tokens.next()?.parse::<f64>().ok()?;
+    let factor = time_unit_to_ns(tokens.next()?)?;
+
+    Some((benchmark_name, (value * factor).round() as u64))
+}
+
 fn parse_benchmark_output(
     output: &str,
     crate_name: &str,
     _execution_time: Duration,
 ) -> Result<Vec<BenchmarkResult>> {
     let mut results = Vec::new();
+    // 同一次输出中的所有结果共享时间戳和提交号，只需获取一次
+    let timestamp = chrono::Utc::now().to_rfc3339();
+    let git_commit = get_git_commit().ok();
+    // 最近一个不含 `time:` 的非空行，用作换行输出时的基准名称
+    let mut previous_line = None;
 
     // 解析 Criterion 输出格式
     // 这是一个简化的解析器，实际生产中需要更复杂的解析
     for line in output.lines() {
-        if line.contains("time:") {
-            // 示例行: "node_creation              time:   [1.2345 ms 1.2456 ms 1.2567 ms]"
-            let parts: Vec<&str> = line.split_whitespace().collect();
-            if parts.len() >= 4 {
-                let benchmark_name = parts[0].to_string();
-                if let Some(time_str) = parts.get(3) {
-                    // 解析时间值，移除单位
-                    let time_str = time_str
-                        .replace("[", "")
-                        .replace("ms", "")
-                        .replace("us", "")
-                        .replace("ns", "");
-                    if let Ok(duration_ms) = time_str.parse::<f64>() {
-                        let duration_ns = (duration_ms * 1_000_000.0) as u64;
-
-                        results.push(BenchmarkResult {
-                            crate_name: crate_name.to_string(),
-                            benchmark_name,
-                            duration_ns,
-                            memory_usage_bytes: 0, // 需要从其他来源获取
-                            cpu_utilization_percent: 0.0,
-                            timestamp: chrono::Utc::now().to_rfc3339(),
-                            git_commit: get_git_commit().ok(),
-                            metadata: HashMap::new(),
-                        });
-                    }
-                }
+        // 每行只做一次 `time:` 子串查找，切分结果直接交给解析函数
+        let Some((name, rest)) = line.split_once("time:") else {
+            if !line.trim().is_empty() {
+                previous_line = Some(line);
             }
+            continue;
+        };
+
+        match parse_criterion_time(name, rest, previous_line) {
+            Some((benchmark_name, duration_ns)) => {
+                results.push(BenchmarkResult {
+                    crate_name: crate_name.to_string(),
+                    benchmark_name: benchmark_name.to_string(),
+                    duration_ns,
+                    memory_usage_bytes: 0, // 需要从其他来源获取
+                    cpu_utilization_percent: 0.0,
+                    timestamp: timestamp.clone(),
+                    git_commit: git_commit.clone(),
+                    metadata: HashMap::new(),
+                });
+            },
+            // 吞吐量模式下 `change:` 之后的 `time: [-1.0% ...]` 是变化百分比，
+            // 不是时间估计，直接跳过
+            None if rest.contains('%') => {},
+            None => {
+                eprintln!("⚠️ 无法解析 {crate_name} 的基准测试输出: {line}");
+            },
         }
     }
 
     Ok(results)
 }
 
+/// 将结果直接序列化到带缓冲的文件中，避免先构建完整的 JSON 字符串
+fn write_results_json(
+    path: &str,
+    results: &[BenchmarkResult],
+) -> Result<()> {
+    let file = std::fs::File::create(path)
+        .context(format!("创建结果文件 {path} 失败"))?;
+    let mut writer = std::io::BufWriter::new(file);
+    serde_json::to_writer_pretty(&mut writer, results)?;
+    writer.flush()?;
+    Ok(())
+}
+
 fn get_git_commit() -> Result<String> {
     let output = Command::new("git").args(["rev-parse", "HEAD"]).output()?;
 
@@ -456,3 +515,97 @@ async fn main() -> Result<()> {
 
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn parse_criterion_line<'a>(
+        line: &'a str,
+        previous_line: Option<&'a str>,
+    ) -> Option<(&'a str, u64)> {
+        let (name, rest) = line.split_once("time:")?;
+        parse_criterion_time(name, rest, previous_line)
+    }
+
+    #[test]
+    fn test_parse_criterion_line_single_line() {
+        let line = "node_creation              time:   [1.2345 ms 1.2456 ms 1.2567 ms]";
+        assert_eq!(
+            parse_criterion_line(line, None),
+            Some(("node_creation", 1_245_600))
+        );
+    }
+
+    #[test]
+    fn test_parse_criterion_line_wrapped() {
+        let line = "                        time:   [10.1 µs 12.5 µs 13.0 µs]";
+        assert_eq!(
+            parse_criterion_line(line, Some("基础节点操作/节点创建")),
+            Some(("基础节点操作/节点创建", 12_500))
+        );
+        assert_eq!(parse_criterion_line(line, None), None);
+    }
+
+    #[test]
+    fn test_parse_criterion_line_units() {
+        let cases = [
+            ("[900.1 ps 901.2 ps 902.3 ps]", 1),
+            ("[1.0 ns 2.0 ns 3.0 ns]", 2),
+            ("[1.0 µs 2.0 µs 3.0 µs]", 2_000),
+            ("[1.0 μs 2.0 μs 3.0 μs]", 2_000),
+            ("[1.0 us 2.0 us 3.0 us]", 2_000),
+            ("[1.0 ms 2.0 ms 3.0 ms]", 2_000_000),
+            ("[1.0 s 2.0 s 3.0 s]", 2_000_000_000),
+        ];
+        for (estimates, expected_ns) in cases {
+            let line = format!("bench time: {estimates}");
+            assert_eq!(
+                parse_criterion_line(&line, None),
+                Some(("bench", expected_ns)),
+                "{estimates}"
+            );
+        }
+        assert_eq!(
+            parse_criterion_line("bench time: [1.0 ps 1500.0 ps 2.0 ns]", None),
+            Some(("bench", 2))
+        );
+    }
+
+    #[test]
+    fn test_parse_benchmark_output() {
+        let output = "\
+short_bench             time:   [1.0 ns 2.0 ns 3.0 ns]
+                        change: [-1.0% +0.5% +2.0%] (p = 0.50 > 0.05)
+                        No change in performance detected.
+
+hierarchy_ops/validate_hierarchy
+                        time:   [1.0 ms 1.5 ms 2.0 ms]
+                        thrpt:  [500.00 Kelem/s 666.67 Kelem/s 1.0000 Melem/s]
+                 change:
+                        time:   [-1.0% +0.5% +2.0%] (p = 0.50 > 0.05)
+                        thrpt:  [-1.9608% -0.4975% +1.0101%]
+                        No change in performance detected.
+Found 2 outliers among 100 measurements (2.00%)
+  2 (2.00%) high mild
+基础节点操作/节点创建
+                        time:   [900.0 ps 950.0 ps 1.0 ns]
+";
+        let results =
+            parse_benchmark_output(output, "moduforge-model", Duration::ZERO)
+                .unwrap();
+        let parsed: Vec<_> = results
+            .iter()
+            .map(|r| (r.benchmark_name.as_str(), r.duration_ns))
+            .collect();
+        assert_eq!(
+            parsed,
+            vec![
+                ("short_bench", 2),
+                ("hierarchy_ops/validate_hierarchy", 1_500_000),
+                ("基础节点操作/节点创建", 1),
+            ]
+        );
+        assert!(results.iter().all(|r| r.crate_name == "moduforge-model"));
+    }
+}